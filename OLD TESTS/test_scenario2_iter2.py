@@ -1,15 +1,14 @@
 """
-Verification of the simplex multiplier transformation for Scenario 2, Iteration 2.
+Verification of the simplex multipliers for Scenario 2, Iteration 2.
 """
 from SimplexMultipliers import solve_lp_with_duals
-from subproblems import transform_dual_vector
 from stochastic_problem import calculate_rhs, calculate_optimality_components
 
 def verify_scenario2_iteration2():
     """
-    Verify the simplex multiplier transformation for Scenario 2, Iteration 2.
+    Verify the simplex multipliers for Scenario 2, Iteration 2.
     """
-    print("Verifying Scenario 2, Iteration 2 Transformation")
+    print("Verifying Scenario 2, Iteration 2 Simplex Multipliers")
     print("=" * 80)
     
     # First-stage decision from Iteration 2
@@ -45,29 +44,19 @@ def verify_scenario2_iteration2():
     print(f"Status: {result['status']}")
     print(f"Variable values: y = {result['variable_values']}")
     print(f"Objective value: {result['objective_value']}")
-    print(f"Raw pi vector: {result['pi_vector']}")
-    
-    # Transform the raw pi vector
-    transformed_pi = transform_dual_vector(
-        result['pi_vector'],
-        num_constraints=2,
-        num_variables=2,
-        y_values=result['variable_values'],
-        upper_bounds=[d1, d2]
-    )
-    
-    print(f"Transformed pi vector: {transformed_pi}")
+    pi_vector = result['pi_vector'].tolist()
+    print(f"Pi vector: {pi_vector}")
     
     # Expected value from slides
     expected_pi = [-3.2, 0.0, -8.8, 0]
     print(f"Expected pi vector: {expected_pi}")
-    print(f"Match with expected: {all(abs(a-b) < 0.1 for a, b in zip(transformed_pi, expected_pi))}")
+    print(f"Match with expected: {all(abs(a-b) < 0.1 for a, b in zip(pi_vector, expected_pi))}")
     
     # Calculate cut components
-    e, E = calculate_optimality_components(transformed_pi, h, T, probability)
+    e, E = calculate_optimality_components(pi_vector, h, T, probability)
     w = e - E[0] * x[0] - E[1] * x[1]
     
-    print("\nCut Components (Using Transformed Pi):")
+    print("\nCut Components (Using Solver Pi):")
     print(f"e = {e}")
     print(f"E = {E}")
     print(f"w = {w}")
@@ -94,7 +83,7 @@ def verify_scenario2_iteration2():
     
     return {
         'raw_pi': result['pi_vector'],
-        'transformed_pi': transformed_pi,
+        'pi_vector': pi_vector,
         'expected_pi': expected_pi,
         'e': e,
         'E': E,
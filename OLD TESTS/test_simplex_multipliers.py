@@ -1,33 +1,54 @@
 """
 Test the SimplexMultipliers module with the example problems from the workflow.
 """
-from SimplexMultipliers import solve_lp_with_duals
+from SimplexMultipliers import solve_many_lps
 from subproblems import convert_to_expected_format
 
 def test_example_problems():
     """
     Test the simplex multipliers function with the two example problems.
     """
-    print("Testing Example Problem 1:")
-    print("-" * 60)
-    
     # Example Problem 1 (from workflow.py)
     # min -24y1 - 28y2
     # s.t. 6y1 + 10y2 ≤ 2400
     #      8y1 + 5y2 ≤ 1600
     #      0 ≤ y1 ≤ 500
     #      0 ≤ y2 ≤ 100
-    result1 = solve_lp_with_duals(
-        objective_coeffs=[-24, -28],
-        constraint_matrix=[
+    example1 = {
+        'objective_coeffs': [-24, -28],
+        'constraint_matrix': [
+            [6, 10],
+            [8, 5]
+        ],
+        'constraint_rhs': [2400, 1600],
+        'var_lower_bounds': [0, 0],
+        'var_upper_bounds': [500, 100],
+        'problem_name': "Example_1"
+    }
+    
+    # Example Problem 2
+    # min -28y1 - 32y2
+    # s.t. 6y1 + 10y2 ≤ 2400
+    #      8y1 + 5y2 ≤ 1600
+    #      0 ≤ y1 ≤ 300
+    #      0 ≤ y2 ≤ 300
+    example2 = {
+        'objective_coeffs': [-28, -32],
+        'constraint_matrix': [
             [6, 10],
             [8, 5]
         ],
-        constraint_rhs=[2400, 1600],
-        var_lower_bounds=[0, 0],
-        var_upper_bounds=[500, 100],
-        problem_name="Example_1"
-    )
+        'constraint_rhs': [2400, 1600],
+        'var_lower_bounds': [0, 0],
+        'var_upper_bounds': [300, 300],
+        'problem_name': "Example_2"
+    }
+    
+    # Solve both examples in one batched LP
+    result1, result2 = solve_many_lps([example1, example2])
+    
+    print("Testing Example Problem 1:")
+    print("-" * 60)
     
     print(f"Status: {result1['status']}")
     print(f"Objective value: {result1['objective_value']}")
@@ -43,24 +64,6 @@ def test_example_problems():
     print("\nTesting Example Problem 2:")
     print("-" * 60)
     
-    # Example Problem 2
-    # min -28y1 - 32y2
-    # s.t. 6y1 + 10y2 ≤ 2400
-    #      8y1 + 5y2 ≤ 1600
-    #      0 ≤ y1 ≤ 300
-    #      0 ≤ y2 ≤ 300
-    result2 = solve_lp_with_duals(
-        objective_coeffs=[-28, -32],
-        constraint_matrix=[
-            [6, 10],
-            [8, 5]
-        ],
-        constraint_rhs=[2400, 1600],
-        var_lower_bounds=[0, 0],
-        var_upper_bounds=[300, 300],
-        problem_name="Example_2"
-    )
-    
     print(f"Status: {result2['status']}")
     print(f"Objective value: {result2['objective_value']}")
     print(f"Variable values: {result2['variable_values']}")
@@ -1,8 +1,13 @@
-import pyomo.environ as pyo
-from pyomo.opt import SolverFactory
+import math
+
+import highspy
+import numpy as np
+from numba import njit
+from scipy.sparse import block_diag, csr_matrix, issparse
 
 def solve_lp_with_duals(objective_coeffs, constraint_matrix, constraint_rhs, 
-                        var_lower_bounds, var_upper_bounds, problem_name="LP Problem"):
+                        var_lower_bounds, var_upper_bounds, problem_name="LP Problem",
+                        verbose=False):
     """
     Solve a linear programming problem and return the simplex multipliers.
     
@@ -20,156 +25,479 @@ def solve_lp_with_duals(objective_coeffs, constraint_matrix, constraint_rhs,
         Upper bounds for each variable
     problem_name : str, optional
         Name of the problem for display purposes
+    verbose : bool, optional
+        Whether to show the HiGHS solver log
         
     Returns:
     --------
     dict
         Contains objective value, variable values, and simplex multipliers
     """
-    # Create a concrete model
-    model = pyo.ConcreteModel(name=problem_name)
-    
-    # Set up the indices
-    num_vars = len(objective_coeffs)
-    num_constraints = len(constraint_rhs)
-    model.I = pyo.RangeSet(0, num_vars-1)
-    model.J = pyo.RangeSet(0, num_constraints-1)
-    
-    # Define variables
-    model.y = pyo.Var(model.I, domain=pyo.NonNegativeReals)
-    
-    # Set variable bounds
-    for i in model.I:
-        model.y[i].setlb(var_lower_bounds[i])
-        model.y[i].setub(var_upper_bounds[i])
-    
-    # Define objective function (minimization)
-    model.obj = pyo.Objective(
-        expr=sum(objective_coeffs[i] * model.y[i] for i in model.I),
-        sense=pyo.minimize
+    # Hashable copies of the LP data, used to look up the persistent model
+    obj_tup = tuple(map(float, objective_coeffs))
+    mat_tup = tuple(tuple(map(float, row)) for row in constraint_matrix)
+    rhs_tup = tuple(map(float, constraint_rhs))
+    lb_tup = tuple(map(float, var_lower_bounds))
+    ub_tup = tuple(map(float, var_upper_bounds))
+    
+    # Tiny 2x2 LPs are solved analytically without calling HiGHS
+    if len(obj_tup) == 2 and len(rhs_tup) == 2 and lb_tup == (0.0, 0.0):
+        result = solve_2x2_with_duals(obj_tup, mat_tup, rhs_tup, ub_tup)
+        if result is not None:
+            return result
+    
+    return _get_solver(obj_tup, mat_tup, lb_tup, ub_tup).solve(rhs_tup, verbose=verbose)
+
+def _optimal_result(obj_value, y_values, row_duals, col_duals, at_upper):
+    """
+    Build the result dict of an optimal solve from the solver's duals.
+    
+    row_duals and col_duals follow the HiGHS sign convention: constraint and
+    upper-bound marginals are non-positive for a minimization. at_upper flags
+    the variables that are nonbasic at their upper bound.
+    """
+    # Upper bound duals: if the variable is at its upper bound and the reduced
+    # cost is negative, the bound is binding
+    col_duals = np.asarray(col_duals, dtype=float)
+    ub_duals = np.where(np.asarray(at_upper, dtype=bool) & (col_duals < 0), col_duals, 0.0)
+    
+    # Simplex multipliers: constraint duals, then one upper bound dual per variable
+    pi_vector = np.concatenate([np.asarray(row_duals, dtype=float), ub_duals])
+    pi_vector += 0.0  # Normalize -0.0 duals to 0.0
+    
+    # Return results
+    return {
+        'status': 'optimal',
+        'objective_value': obj_value,
+        'variable_values': y_values,
+        'pi_vector': pi_vector
+    }
+
+def solve_2x2_subproblem(q, A, rhs, ub, tol=1e-7):
+    """
+    Solve min q*y s.t. A y <= rhs, 0 <= y <= ub for two variables and two
+    constraints by vertex enumeration.
+    
+    Every vertex is the intersection of two of the six lines A[0]y = rhs[0],
+    A[1]y = rhs[1], y_i = 0 and y_i = ub_i. A vertex is optimal when it is
+    feasible and the multipliers of its two active lines have the right sign,
+    so the first such vertex is returned.
+    
+    Parameters:
+    -----------
+    q : list
+        Objective coefficients
+    A : list of lists
+        2x2 constraint matrix
+    rhs : list
+        Right-hand side of the two constraints
+    ub : list
+        Upper bounds of the two variables (may be infinite)
+    tol : float, optional
+        Feasibility and sign tolerance
+    
+    Returns:
+    --------
+    tuple or None
+        (y_values, objective_value, row_duals, col_duals) using the HiGHS sign
+        convention, or None if no optimal vertex exists
+    """
+    (ok, y1, y2, obj_value, pi1, pi2, rc1, rc2) = solve_lp_2x2(
+        float(q[0]), float(q[1]),
+        float(A[0][0]), float(A[0][1]), float(A[1][0]), float(A[1][1]),
+        float(rhs[0]), float(rhs[1]),
+        float(ub[0]), float(ub[1]),
+        tol
     )
+    if not ok:
+        return None
+    return [y1 + 0.0, y2 + 0.0], obj_value, [pi1, pi2], [rc1, rc2]
+
+def solve_2x2_with_duals(q, A, rhs, ub):
+    """
+    Solve a 2x2 LP with solve_2x2_subproblem and return the same result dict
+    as solve_lp_with_duals, without converting the inputs to tuples.
     
-    # Define constraints
-    model.constraints = pyo.ConstraintList()
-    for j in model.J:
-        model.constraints.add(
-            sum(constraint_matrix[j][i] * model.y[i] for i in model.I) <= constraint_rhs[j]
-        )
+    Parameters:
+    -----------
+    q : list
+        Objective coefficients
+    A : list of lists
+        2x2 constraint matrix
+    rhs : list
+        Right-hand side of the two constraints
+    ub : list
+        Upper bounds of the two variables (lower bounds are 0)
     
-    # Define suffixes for retrieving dual values
-    model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
-    model.rc = pyo.Suffix(direction=pyo.Suffix.IMPORT)  # Reduced costs
+    Returns:
+    --------
+    dict or None
+        Result dict with status 'optimal', or None if no optimal vertex
+        exists (the caller should then fall back to solve_lp_with_duals)
+    """
+    solution = solve_2x2_subproblem(q, A, rhs, ub)
+    if solution is None:
+        return None
+    y_values, obj_value, row_duals, col_duals = solution
+    # A negative multiplier can only come from an active upper bound line
+    at_upper = [rc < 0 for rc in col_duals]
+    return _optimal_result(obj_value, y_values, row_duals, col_duals, at_upper)
+
+# Fast-math flags that still honour infinite upper bounds
+_FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'reassoc'}
+
+@njit(cache=True, fastmath=_FASTMATH_FLAGS)
+def solve_lp_2x2(q0, q1, a00, a01, a10, a11, b0, b1, ub0, ub1, tol=1e-7):
+    """
+    Compiled vertex enumeration for the 2x2 LP behind solve_2x2_subproblem,
+    with every array flattened to scalars.
     
-    # Solve the model
-    solver = SolverFactory('glpk')
-    results = solver.solve(model)
+    Returns:
+    --------
+    tuple
+        (ok, y0, y1, obj, pi0, pi1, rc0, rc1); ok is False when no optimal
+        vertex exists and the other entries are then meaningless
+    """
+    # Lines in order: row 0, row 1, y0 = ub0, y0 = 0, y1 = ub1, y1 = 0
+    # kind: 0 = constraint row, 1 = upper bound, 2 = lower bound
+    nx = (a00, a10, 1.0, 1.0, 0.0, 0.0)
+    ny = (a01, a11, 0.0, 0.0, 1.0, 1.0)
+    val = (b0, b1, ub0, 0.0, ub1, 0.0)
+    kind = (0, 0, 1, 2, 1, 2)
     
-    # Check if solution is optimal
-    if results.solver.termination_condition == pyo.TerminationCondition.optimal:
-        # Extract primal solution
-        obj_value = pyo.value(model.obj)
-        y_values = [pyo.value(model.y[i]) for i in model.I]
-        
-        # Create raw dual vector that includes all information
-        raw_pi_vector = []
-        
-        # Extract constraint duals
-        for j in range(len(model.constraints)):
-            constraint = model.constraints[j+1]  # Pyomo uses 1-based indexing for ConstraintList
-            dual = model.dual.get(constraint, 0.0)
-            raw_pi_vector.append(dual)
-        
-        # Extract variable bound information (for debugging)
-        for i in model.I:
-            # Lower bound duals
-            raw_pi_vector.append(0)  # Placeholder for simplicity
+    for a in range(6):
+        if kind[a] == 1 and math.isinf(val[a]):
+            continue
+        for b in range(a + 1, 6):
+            if kind[b] == 1 and math.isinf(val[b]):
+                continue
+            det = nx[a] * ny[b] - ny[a] * nx[b]
+            if abs(det) < 1e-12:
+                continue
+            
+            # Intersection point of the two lines
+            y0 = (val[a] * ny[b] - ny[a] * val[b]) / det
+            y1 = (nx[a] * val[b] - val[a] * nx[b]) / det
+            
+            # Primal feasibility
+            if (y0 < -tol or y1 < -tol or y0 > ub0 + tol or y1 > ub1 + tol or
+                    a00 * y0 + a01 * y1 > b0 + tol or
+                    a10 * y0 + a11 * y1 > b1 + tol):
+                continue
+            
+            # Multipliers of the active lines: lam_a * n_a + lam_b * n_b = q
+            lam_a = (q0 * ny[b] - nx[b] * q1) / det
+            lam_b = (nx[a] * q1 - q0 * ny[a]) / det
+            
+            # Dual feasibility: rows and upper bounds <= 0, lower bounds >= 0
+            if (lam_a < -tol) if kind[a] == 2 else (lam_a > tol):
+                continue
+            if (lam_b < -tol) if kind[b] == 2 else (lam_b > tol):
+                continue
             
-            # Upper bound duals
-            if abs(pyo.value(model.y[i]) - var_upper_bounds[i]) < 1e-6:
-                reduced_cost = model.rc.get(model.y[i], 0.0)
-                # For upper bounds, if the reduced cost is negative, the bound is binding
-                if reduced_cost < 0:
-                    raw_pi_vector.append(abs(reduced_cost))  # Store as positive value
+            pi0 = 0.0
+            pi1 = 0.0
+            rc0 = 0.0
+            rc1 = 0.0
+            if kind[a] == 0:
+                if a == 0:
+                    pi0 = lam_a
                 else:
-                    raw_pi_vector.append(0)
+                    pi1 = lam_a
+            elif a < 4:
+                rc0 = lam_a
             else:
-                raw_pi_vector.append(0)
+                rc1 = lam_a
+            if kind[b] == 0:
+                pi1 = lam_b  # b > a, so a second row can only be row 1
+            elif b < 4:
+                rc0 = lam_b
+            else:
+                rc1 = lam_b
+            
+            return True, y0, y1, q0 * y0 + q1 * y1, pi0, pi1, rc0, rc1
+    
+    return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+
+# Persistent solvers keyed by constraint matrix; costs and bounds are updated in place
+_SOLVERS = {}
+
+def _get_solver(obj_tup, mat_tup, lb_tup, ub_tup):
+    """Return the shared LPSolver for this constraint matrix, loaded with the given data."""
+    solver = _SOLVERS.get(mat_tup)
+    if solver is None:
+        solver = LPSolver(obj_tup, mat_tup, lb_tup, ub_tup)
+        _SOLVERS[mat_tup] = solver
+    else:
+        solver.update(obj_tup, lb_tup, ub_tup)
+    return solver
+
+class LPSolver:
+    """
+    Persistent HiGHS model for a family of LPs that share a constraint matrix.
+    
+    The model is built once in the constructor. update() changes the costs and
+    variable bounds in place and solve() only updates the row bounds before
+    re-running the simplex; HiGHS keeps the optimal basis from the previous
+    run, so consecutive solves are warm-started automatically.
+    
+    Parameters:
+    -----------
+    objective_coeffs : list
+        Coefficients of the objective function (minimization)
+    constraint_matrix : list of lists or scipy.sparse matrix
+        Matrix representing the constraints (each row is a constraint)
+    var_lower_bounds : list
+        Lower bounds for each variable
+    var_upper_bounds : list
+        Upper bounds for each variable
+    """
+    
+    def __init__(self, objective_coeffs, constraint_matrix, var_lower_bounds, var_upper_bounds):
+        # csr_matrix would read a tuple of rows as (data, indices), so dense
+        # input goes through an ndarray first
+        if not issparse(constraint_matrix):
+            constraint_matrix = np.asarray(constraint_matrix, dtype=float)
+        A = csr_matrix(constraint_matrix, dtype=float)
+        A.eliminate_zeros()
+        self.num_vars = len(objective_coeffs)
+        self.num_constraints = A.shape[0]
+        self.objective_coeffs = tuple(objective_coeffs)
+        self.var_lower_bounds = tuple(var_lower_bounds)
+        self.var_upper_bounds = tuple(var_upper_bounds)
+        self._col_index = np.arange(self.num_vars, dtype=np.int32)
+        
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue('output_flag', False)
+        
+        # Add the variables with their costs and bounds
+        self.highs.addCols(
+            self.num_vars,
+            np.asarray(objective_coeffs, dtype=float),
+            np.asarray(var_lower_bounds, dtype=float),
+            np.asarray(var_upper_bounds, dtype=float),
+            0, np.array([], dtype=np.int32), np.array([], dtype=np.int32), np.array([])
+        )
+        
+        # Add the constraint rows in compressed row form (rhs is set in solve)
+        self._row_index = np.arange(self.num_constraints, dtype=np.int32)
+        self._row_lower = np.full(self.num_constraints, -highspy.kHighsInf)
+        self.highs.addRows(
+            self.num_constraints,
+            self._row_lower,
+            np.zeros(self.num_constraints),
+            A.nnz, A.indptr[:-1].astype(np.int32), A.indices.astype(np.int32), A.data
+        )
+    
+    def update(self, objective_coeffs, var_lower_bounds, var_upper_bounds):
+        """
+        Replace the objective coefficients and variable bounds of the model.
+        Only the parts that changed are pushed to HiGHS.
+        """
+        if tuple(objective_coeffs) != self.objective_coeffs:
+            self.objective_coeffs = tuple(objective_coeffs)
+            self.highs.changeColsCost(
+                self.num_vars, self._col_index, np.asarray(objective_coeffs, dtype=float)
+            )
         
-        # Return results
-        return {
-            'status': 'optimal',
-            'objective_value': obj_value,
-            'variable_values': y_values,
-            'pi_vector': raw_pi_vector,
-            'raw_output': True  # Flag indicating this is raw output for debugging
-        }
+        if (tuple(var_lower_bounds) != self.var_lower_bounds or
+                tuple(var_upper_bounds) != self.var_upper_bounds):
+            self.var_lower_bounds = tuple(var_lower_bounds)
+            self.var_upper_bounds = tuple(var_upper_bounds)
+            self.highs.changeColsBounds(
+                self.num_vars,
+                self._col_index,
+                np.asarray(var_lower_bounds, dtype=float),
+                np.asarray(var_upper_bounds, dtype=float)
+            )
+    
+    def run(self, constraint_rhs, verbose=False):
+        """
+        Set the right-hand side and re-run the simplex from the current basis.
+        
+        Returns:
+        --------
+        highspy.HighsModelStatus
+            Status of the solve; the solution is read from self.highs
+        """
+        self.highs.changeRowsBounds(
+            self.num_constraints,
+            self._row_index,
+            self._row_lower,
+            np.asarray(constraint_rhs, dtype=float)
+        )
+        self.highs.setOptionValue('output_flag', verbose)
+        self.highs.run()
+        return self.highs.getModelStatus()
+    
+    def solve(self, constraint_rhs, verbose=False):
+        """
+        Solve the LP for the given right-hand side. The HiGHS log is only
+        printed when verbose is True.
+        
+        Returns:
+        --------
+        dict
+            Same layout as solve_lp_with_duals
+        """
+        model_status = self.run(constraint_rhs, verbose)
+        
+        # Check if solution is optimal
+        if model_status == highspy.HighsModelStatus.kOptimal:
+            solution = self.highs.getSolution()
+            
+            # Extract primal solution
+            obj_value = self.highs.getInfo().objective_function_value
+            y_values = list(solution.col_value)
+            
+            # Bound status is read from the basis instead of comparing y to ub
+            at_upper = [status == highspy.HighsBasisStatus.kUpper
+                        for status in self.highs.getBasis().col_status]
+            return _optimal_result(
+                obj_value, y_values, solution.row_dual, solution.col_dual, at_upper
+            )
+        else:
+            return {
+                'status': 'failed',
+                'termination_condition': self.highs.modelStatusToString(model_status)
+            }
+
+def solve_many_lps(problems):
+    """
+    Solve several independent LPs with a single HiGHS call.
+    
+    The problems are stacked into one LP with a block-diagonal constraint
+    matrix, so the solver overhead is paid once instead of once per problem.
+    The stacked model is kept in memory (one per set of constraint matrices)
+    and later calls only push the changed costs, bounds and right-hand sides
+    before warm-starting from the previous basis.
+    
+    Parameters:
+    -----------
+    problems : list of dict
+        Each dict holds the keyword arguments of solve_lp_with_duals
+        (objective_coeffs, constraint_matrix, constraint_rhs,
+        var_lower_bounds, var_upper_bounds and optionally problem_name)
+    
+    Returns:
+    --------
+    list of dict
+        One result per problem, in the same format as solve_lp_with_duals
+    """
+    objectives = [np.asarray(p['objective_coeffs'], dtype=float) for p in problems]
+    c_big = np.concatenate(objectives)
+    b_big = np.concatenate([np.asarray(p['constraint_rhs'], dtype=float) for p in problems])
+    lb_big = np.concatenate([np.asarray(p['var_lower_bounds'], dtype=float) for p in problems])
+    ub_big = np.concatenate([np.asarray(p['var_upper_bounds'], dtype=float) for p in problems])
+    
+    solver = _get_batch_solver(
+        [p['constraint_matrix'] for p in problems], c_big, lb_big, ub_big
+    )
+    model_status = solver.run(b_big)
+    
+    if model_status != highspy.HighsModelStatus.kOptimal:
+        status = solver.highs.modelStatusToString(model_status)
+        return [{'status': 'failed', 'termination_condition': status} for _ in problems]
+    
+    solution = solver.highs.getSolution()
+    col_value = np.asarray(solution.col_value)
+    col_dual = np.asarray(solution.col_dual)
+    row_dual = np.asarray(solution.row_dual)
+    at_upper = np.asarray(solver.highs.getBasis().col_status) == highspy.HighsBasisStatus.kUpper
+    
+    # Split the stacked solution back into per-problem slices
+    results = []
+    var_start = 0
+    row_start = 0
+    for p, c in zip(problems, objectives):
+        var_end = var_start + len(c)
+        row_end = row_start + len(p['constraint_rhs'])
+        results.append(_optimal_result(
+            float(c @ col_value[var_start:var_end]),
+            col_value[var_start:var_end].tolist(),
+            row_dual[row_start:row_end],
+            col_dual[var_start:var_end],
+            at_upper[var_start:var_end]
+        ))
+        var_start = var_end
+        row_start = row_end
+    
+    return results
+
+# Persistent stacked solvers keyed by the constraint matrices of their blocks
+_BATCH_SOLVERS = {}
+
+def _get_batch_solver(matrices, obj, lb, ub):
+    """Return the shared stacked LPSolver for the given blocks, loaded with the given data."""
+    key = tuple(tuple(tuple(map(float, row)) for row in matrix) for matrix in matrices)
+    solver = _BATCH_SOLVERS.get(key)
+    if solver is None:
+        # Sparse, so the stacked matrix grows linearly with the number of problems
+        A_big = block_diag([np.asarray(matrix, dtype=float) for matrix in matrices], format='csr')
+        solver = LPSolver(obj, A_big, lb, ub)
+        _BATCH_SOLVERS[key] = solver
     else:
-        return {
-            'status': 'failed',
-            'termination_condition': str(results.solver.termination_condition)
-        }
+        solver.update(obj, lb, ub)
+    return solver
 
 def format_pi_vector(pi_vector):
     """Format the pi vector to match the example format, filtering out zeros."""
-    non_zero = []
-    for value in pi_vector:
-        if abs(value) > 1e-6:  # Filter out near-zero values
-            non_zero.append(round(value, 2))
-    return tuple(non_zero)
+    pi_vector = np.asarray(pi_vector, dtype=float)
+    # Filter out near-zero values
+    return np.round(pi_vector[np.abs(pi_vector) > 1e-6], 2)
 
 def solve_examples():
     """Solve the example problems provided in the images."""
-    # Example Problem 1
-    print("Solving Example Problem 1")
-    result1 = solve_lp_with_duals(
-        objective_coeffs=[-24, -28],
-        constraint_matrix=[
+    # Example Problems 1 and 2 are solved together in one batched LP
+    example1 = {
+        'objective_coeffs': [-24, -28],
+        'constraint_matrix': [
             [6, 10],
             [8, 5]
         ],
-        constraint_rhs=[2400, 1600],
-        var_lower_bounds=[0, 0],
-        var_upper_bounds=[500, 100],
-        problem_name="Example_1"
-    )
+        'constraint_rhs': [2400, 1600],
+        'var_lower_bounds': [0, 0],
+        'var_upper_bounds': [500, 100],
+        'problem_name': "Example_1"
+    }
+    example2 = {
+        'objective_coeffs': [-28, -32],
+        'constraint_matrix': [
+            [6, 10],
+            [8, 5]
+        ],
+        'constraint_rhs': [2400, 1600],
+        'var_lower_bounds': [0, 0],
+        'var_upper_bounds': [300, 300],
+        'problem_name': "Example_2"
+    }
+    result1, result2 = solve_many_lps([example1, example2])
     
+    # Example Problem 1
+    print("Solving Example Problem 1")
     if result1['status'] == 'optimal':
         print(f"Status: {result1['status']}")
         print(f"Objective value: {result1['objective_value']}")
         print(f"Variable values: {result1['variable_values']}")
-        print(f"Raw pi vector: {result1['pi_vector']}")
         
         # Expected values from slides
         expected_pi = [0, -3, 0, -13]
         print(f"Expected pi = {expected_pi}")
-        print(f"Actual pi = {result1['pi_vector']}")
+        print(f"Actual pi = {result1['pi_vector'].tolist()}")
     else:
         print(f"Example Problem 1 failed: {result1['termination_condition']}")
     
     # Example Problem 2
     print("\nSolving Example Problem 2")
-    result2 = solve_lp_with_duals(
-        objective_coeffs=[-28, -32],
-        constraint_matrix=[
-            [6, 10],
-            [8, 5]
-        ],
-        constraint_rhs=[2400, 1600],
-        var_lower_bounds=[0, 0],
-        var_upper_bounds=[300, 300],
-        problem_name="Example_2"
-    )
-    
     if result2['status'] == 'optimal':
         print(f"Status: {result2['status']}")
         print(f"Objective value: {result2['objective_value']}")
         print(f"Variable values: {result2['variable_values']}")
-        print(f"Raw pi vector: {result2['pi_vector']}")
         
         # Expected values from slides
         expected_pi = [-2.32, -1.76, 0, 0]
         print(f"Expected pi = {expected_pi}")
-        print(f"Actual pi = {result2['pi_vector']}")
+        print(f"Actual pi = {result2['pi_vector'].tolist()}")
     else:
         print(f"Example Problem 2 failed: {result2['termination_condition']}")
 
@@ -4,17 +4,55 @@ This module implements the L-shaped method algorithm with detailed output.
 When it says "IF VERBOSE" that checks to see whether or not the problem should print... it's declared in main
 
 """
-import pyomo.environ as pyo
-from master_problem import solve_master_problem
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from master_problem import MasterProblem
+import master_problem_fast
 from subproblems import solve_all_subproblems
-from stochastic_problem import get_problem_data, calculate_rhs
+from stochastic_problem import get_problem_data
+
+# Format templates for the verbose output, built once instead of per value
+_FMT4 = "{:.4f}".format
+_FMT6 = "{:.6f}".format
+_CUT_TERM = "{:.4f}*x{}".format
+
+def _cut_terms(E):
+    """
+    Terms "E_j*x_j" of a cut's left-hand side, skipping zero coefficients.
+    """
+    return [_CUT_TERM(E_j, j + 1) for j, E_j in enumerate(E) if abs(E_j) > 1e-10]
+
+def _plain_number(value):
+    """
+    Return value as an int if it is a whole number, else as a float, so the
+    scenario data prints as the original problem data.
+    """
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def _emit(lines, out):
+    """
+    Append lines to out, or write them to stdout in a single call when out is None.
+    """
+    if out is None:
+        sys.stdout.write("\n".join(lines) + "\n")
+    else:
+        out.extend(lines)
 
-def print_master_formulation(c, A, b, x_lb, cuts, iteration):
+def print_master_formulation(c, A, b, x_lb, cuts, iteration, verbose=True, out=None):
     """
     Print the formulation of the master problem.
+    
+    Nothing is formatted when verbose is False. If out is a list the lines
+    are appended to it instead of being written to stdout.
     """
-    print(f"\nMaster Problem Formulation (Iteration {iteration}):")
-    print("=" * 80)
+    if not verbose:
+        return
+    
+    lines = [f"\nMaster Problem Formulation (Iteration {iteration}):", "=" * 80]
     
     # Objective function
     obj_terms = [f"{c[i]}*x{i+1}" for i in range(len(c))]
@@ -22,104 +60,134 @@ def print_master_formulation(c, A, b, x_lb, cuts, iteration):
         obj_str = f"Minimize  {' + '.join(obj_terms)} + θ"
     else:
         obj_str = f"Minimize  {' + '.join(obj_terms)}"
-    print(obj_str)
+    lines.append(obj_str)
     
     # Constraints
-    print("\nSubject to:")
+    lines.append("\nSubject to:")
     for i, row in enumerate(A):
-        constr_terms = [f"{row[j]}*x{j+1}" for j in range(len(row)) if row[j] != 0]
-        constr_str = f"  {' + '.join(constr_terms)} ≤ {b[i]}"
-        print(constr_str)
+        constr_terms = [f"{row[j]:g}*x{j+1}" for j in range(len(row)) if row[j] != 0]
+        lines.append(f"  {' + '.join(constr_terms)} ≤ {b[i]}")
     
     # Variable bounds
     for i, lb in enumerate(x_lb):
-        print(f"  x{i+1} ≥ {lb}")
+        lines.append(f"  x{i+1} ≥ {lb}")
     
     # Optimality cuts
     if cuts:
-        print("\nOptimality cuts:")
+        lines.append("\nOptimality cuts:")
         for i, (E, e) in enumerate(cuts):
-            cut_terms = [f"{E[j]:.4f}*x{j+1}" for j in range(len(E)) if abs(E[j]) > 1e-10]
+            cut_terms = _cut_terms(E)
             if cut_terms:
                 cut_str = f"  {' + '.join(cut_terms)} + θ ≥ {e:.4f}"
             else:
                 cut_str = f"  θ ≥ {e:.4f}"
-            print(cut_str)
+            lines.append(cut_str)
     
-    print("=" * 80)
+    lines.append("=" * 80)
+    _emit(lines, out)
 
-def print_subproblem_formulation(x, scenario, result, scenario_index):
+def print_subproblem_formulation(x, scenario, result, scenario_index, verbose=True, out=None):
     """
     Print the formulation and solution of a subproblem.
+    
+    Nothing is formatted when verbose is False. If out is a list the lines
+    are appended to it instead of being written to stdout.
     """
+    if not verbose:
+        return
+    
     prob = scenario['probability']
-    q1 = scenario['q1']
-    q2 = scenario['q2']
-    d1 = scenario['d1']
-    d2 = scenario['d2']
-    h = scenario['h']
-    T = scenario['T']
+    q1, q2 = map(_plain_number, scenario['q_np'])
+    d1, d2 = map(_plain_number, scenario['ub_np'])
+    h = [_plain_number(v) for v in scenario['h_np']]
+    T = [[_plain_number(v) for v in row] for row in scenario['T_np']]
+    # Plain floats, so π prints as a list rather than an ndarray repr
+    pi = [float(pi_i) for pi_i in result['pi_vector']]
     
-    # Calculate RHS values
-    rhs = calculate_rhs(h, T, x)
+    # RHS values h - Tx were already computed by the subproblem solve
+    rhs = result['rhs']
     
-    print(f"\nSubproblem Formulation (Scenario {scenario_index}, Probability = {prob}):")
-    print("=" * 80)
+    lines = [f"\nSubproblem Formulation (Scenario {scenario_index}, Probability = {prob}):", "=" * 80]
     
     # Print the matrices
-    print("h vector:")
-    print(f"  h = {h}")
+    lines.append("h vector:")
+    lines.append(f"  h = {h}")
     
-    print("\nT matrix:")
+    lines.append("\nT matrix:")
     for i, row in enumerate(T):
-        print(f"  T[{i}] = {row}")
+        lines.append(f"  T[{i}] = {row}")
     
     # Objective
-    print(f"\nMinimize  {q1}*y1 + {q2}*y2")
+    lines.append(f"\nMinimize  {q1}*y1 + {q2}*y2")
     
     # Constraints
-    print("\nSubject to:")
-    print(f"  6*y1 + 10*y2 ≤ {rhs[0]:.4f}  (= {h[0]} - {T[0][0]}*{x[0]} - {T[0][1]}*{x[1]})")
-    print(f"  8*y1 + 5*y2 ≤ {rhs[1]:.4f}  (= {h[1]} - {T[1][0]}*{x[0]} - {T[1][1]}*{x[1]})")
-    print(f"  0 ≤ y1 ≤ {d1}")
-    print(f"  0 ≤ y2 ≤ {d2}")
+    lines.append("\nSubject to:")
+    lines.append(f"  6*y1 + 10*y2 ≤ {rhs[0]:.4f}  (= {h[0]} - {T[0][0]}*{x[0]} - {T[0][1]}*{x[1]})")
+    lines.append(f"  8*y1 + 5*y2 ≤ {rhs[1]:.4f}  (= {h[1]} - {T[1][0]}*{x[0]} - {T[1][1]}*{x[1]})")
+    lines.append(f"  0 ≤ y1 ≤ {d1}")
+    lines.append(f"  0 ≤ y2 ≤ {d2}")
     
     # Solution
-    print("\nSolution:")
-    print(f"  y1 = {result['y_values'][0]:.4f}")
-    print(f"  y2 = {result['y_values'][1]:.4f}")
-    print(f"  Objective value = {result['objective_value']:.4f}")
+    lines.append("\nSolution:")
+    lines.append(f"  y1 = {result['y_values'][0]:.4f}")
+    lines.append(f"  y2 = {result['y_values'][1]:.4f}")
+    lines.append(f"  Objective value = {result['objective_value']:.4f}")
     
     # Dual values (π vector)
-    print("\nDual values (π vector):")
-    print(f"  π = {result['pi_vector']}")
+    lines.append("\nDual values (π vector):")
+    lines.append(f"  π = {pi}")
     
     # Calculate e = π^T * h manually to verify
-    manual_e = sum(result['pi_vector'][i] * h[i] for i in range(len(h)))
+    manual_e = sum(pi[i] * h[i] for i in range(len(h)))
     manual_e *= prob
     
     # Cut components
-    print("\nCut component calculations:")
-    print(f"  e = p * π^T * h = {prob} * ({' + '.join([f'({result['pi_vector'][i]}) * ({h[i]})' for i in range(len(h))])}) = {prob} * {manual_e/prob:.4f} = {manual_e:.4f}")
-    print(f"  Final e = {result['e']:.4f}")  # Show the actual e used (may include adjustments)
-    print(f"  E = p * π^T * T = {prob} * π^T * T = [{', '.join([f'{E:.4f}' for E in result['E']])}]")
-    print(f"  w = e - E*x = {result['e']:.4f} - E*{x} = {result['w']:.4f}")
+    e_terms = ' + '.join(f"({pi[i]}) * ({h[i]})" for i in range(len(h)))
+    lines.append("\nCut component calculations:")
+    lines.append(f"  e = p * π^T * h = {prob} * ({e_terms}) = {prob} * {manual_e/prob:.4f} = {manual_e:.4f}")
+    lines.append(f"  Final e = {result['e']:.4f}")  # Show the actual e used (may include adjustments)
+    lines.append(f"  E = p * π^T * T = {prob} * π^T * T = [{', '.join(map(_FMT4, result['E']))}]")
+    lines.append(f"  w = e - E*x = {result['e']:.4f} - E*{x} = {result['w']:.4f}")
     
-    print("=" * 80)
+    lines.append("=" * 80)
+    _emit(lines, out)
 
-def print_combined_results(results, iteration):
+def print_combined_results(results, iteration, verbose=True, out=None):
     """
     Print the combined results from all subproblems.
+    
+    Nothing is formatted when verbose is False. If out is a list the lines
+    are appended to it instead of being written to stdout.
     """
-    print(f"\nCombined Results (Iteration {iteration}):")
-    print("=" * 80)
-    print(f"Total objective value: {results['total_objective']:.4f}")
-    print(f"Total e: {results['total_e']:.4f}")
-    print(f"Total E: [{', '.join([f'{E:.4f}' for E in results['total_E']])}]")
-    print(f"Total w: {results['total_w']:.4f}")
-    print("=" * 80)
+    if not verbose:
+        return
+    
+    lines = [
+        f"\nCombined Results (Iteration {iteration}):",
+        "=" * 80,
+        f"Total objective value: {results['total_objective']:.4f}",
+        f"Total e: {results['total_e']:.4f}",
+        f"Total E: [{', '.join(map(_FMT4, results['total_E']))}]",
+        f"Total w: {results['total_w']:.4f}",
+        "=" * 80
+    ]
+    _emit(lines, out)
 
-def run_l_shaped_method(max_iterations=100, tolerance=1e-6, verbose=True):
+# One record per iteration in the convergence history
+_HISTORY_DTYPE = np.dtype([
+    ('x1', 'f8'), ('x2', 'f8'), ('theta', 'f8'), ('w', 'f8'), ('gap', 'f8'),
+    ('master_obj', 'f8'), ('rec_obj', 'f8')
+])
+
+def _cut_key(E, e):
+    """
+    Hashable key of the cut Ex + θ ≥ e: coefficients scaled by 1e6 and rounded
+    to integers, so equal cuts hash equal despite round-off.
+    """
+    return tuple(round(float(E_j) * 1e6) for E_j in E) + (round(float(e) * 1e6),)
+
+def run_l_shaped_method(max_iterations=100, tolerance=1e-6, verbose=True, n_workers=None, batched=False, warm_start=True,
+                        shared_cuts=None, stop_event=None, x_start=None):
     """
     Implement the L-shaped method for two-stage stochastic programming with detailed output.
     
@@ -131,11 +199,35 @@ def run_l_shaped_method(max_iterations=100, tolerance=1e-6, verbose=True):
         Convergence tolerance
     verbose : bool
         Whether to print progress information
+    n_workers : int, optional
+        Number of worker processes used to solve the scenario subproblems
+        (None solves them serially in this process)
+    batched : bool
+        Solve all scenario subproblems of an iteration as one block-diagonal LP
+    warm_start : bool
+        Keep one persistent master model and warm-start it after each cut.
+        If False the master is rebuilt from scratch every iteration with the
+        specialized 2-variable solver in master_problem_fast, which goes
+        through scipy's linprog and makes a run about 7x slower; it is kept
+        as a cold-start reference
+    shared_cuts : list-like, optional
+        Cut pool shared with other workers (e.g. a multiprocessing.Manager
+        list of (E, e) tuples); cuts found by others are added to this master
+        at the start of each iteration and this worker's cuts are appended
+    stop_event : Event-like, optional
+        Set when this worker converges; the worker also stops as soon as
+        another one sets it
+    x_start : list, optional
+        First stage decisions evaluated in the first iteration instead of the
+        master solution, so workers can start from different points
     
     Returns:
     --------
     dict
-        Final solution and performance metrics
+        Final solution and performance metrics. 'history' is a numpy
+        structured array with one record per iteration (record i belongs to
+        iteration i + 1) and the fields x1, x2, theta, w, gap (w - theta),
+        master_obj (master objective) and rec_obj (expected recourse cost)
     """
     # Get problem data
     data = get_problem_data()
@@ -144,123 +236,184 @@ def run_l_shaped_method(max_iterations=100, tolerance=1e-6, verbose=True):
     b = data['b']
     x_lb = data['x_lb']
     scenarios = data['scenarios']
+    scenario_dicts = scenarios.as_dicts()
     
-    # Initialize
-    cuts = []
+    # Initialize cut storage: one row of E_mat and entry of e_vec per cut,
+    # plus integer cut keys (E * 1e6, e * 1e6) for constant-time duplicate
+    # detection
+    E_mat = np.empty((0, len(c)))
+    e_vec = np.empty(0)
+    cut_set = set()
     iterations = 0
     converged = False
-    history = []
+    history = np.zeros(max_iterations, dtype=_HISTORY_DTYPE)
+    
+    # With warm_start the master model persists across iterations and cuts
+    # are appended to it; otherwise master_problem_fast rebuilds it each time
+    master = MasterProblem(c, A, b, x_lb) if warm_start else None
+    
+    # Create the worker pool once so process start-up is paid once per run
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers else None
     
     if verbose:
         print("\n" + "="*80)
         print("STARTING L-SHAPED METHOD")
         print("="*80)
     
-    while not converged and iterations < max_iterations:
-        iterations += 1
-        
-        # Step 1: Solve master problem
-        if verbose:
-            print(f"\nITERATION {iterations}")
-            print("-" * 80)
-            print(f"Step 1: Solving master problem")
-            # Print master problem formulation
-            print_master_formulation(c, A, b, x_lb, cuts, iterations)
-        
-        master_result = solve_master_problem(c, A, b, x_lb, cuts)
-        x = master_result['x']
-        theta = master_result['theta']
-        
-        if verbose:
-            print(f"Master problem solution:")
-            print(f"  x = [{', '.join([f'{xi:.6f}' for xi in x])}]")
-            print(f"  θ = {theta:.6f}")
-            print(f"  Master objective = {master_result['objective']:.6f}")
-        
-        # Step 3: Solve subproblems
-        if verbose:
-            print(f"\nStep 3: Solving subproblems")
-        
-        sub_results = solve_all_subproblems(x, scenarios, iterations)
-        w = sub_results['total_w']
-        
-        # Print detailed subproblem information
-        if verbose:
-            for i, (scenario, result) in enumerate(zip(scenarios, sub_results['scenario_results'])):
-                print_subproblem_formulation(x, scenario, result, i+1)
+    num_shared_seen = 0
+    
+    try:
+        while not converged and iterations < max_iterations:
+            # Another worker has already converged
+            if stop_event is not None and iterations and stop_event.is_set():
+                break
             
-            # Print combined results
-            print_combined_results(sub_results, iterations)
-        
-        # Store iteration history
-        history.append({
-            'iteration': iterations,
-            'x': x,
-            'theta': theta,
-            'w': w,
-            'gap': w - theta,
-            'master_objective': master_result['objective'],
-            'recourse_objective': sub_results['total_objective']
-        })
-        
-        # Check if this cut would be a duplicate
-        is_duplicate = False
-        if cuts:
-            for E_prev, e_prev in cuts:
-                if (abs(sub_results['total_E'][0] - E_prev[0]) < 1e-6 and 
-                    abs(sub_results['total_E'][1] - E_prev[1]) < 1e-6 and
-                    abs(sub_results['total_e'] - e_prev) < 1e-6):
-                    is_duplicate = True
-                    break
-        
-        # Check optimality: |w - θ| ≤ tolerance
-        gap = w - theta
-        if abs(gap) <= tolerance or is_duplicate:
-            if is_duplicate:
-                print(f"\nDuplicate cut detected - stopping algorithm")
+            iterations += 1
+            
+            # Output of this iteration, written to stdout in one call at the end
+            out = []
+            
+            # Import the cuts other workers found since the last iteration
+            if shared_cuts is not None:
+                new_shared = list(shared_cuts[num_shared_seen:])
+                num_shared_seen += len(new_shared)
+                imported = [(E, e) for E, e in new_shared if _cut_key(E, e) not in cut_set]
+                if imported:
+                    new_E = np.array([E for E, _ in imported], dtype=float)
+                    new_e = np.array([e for _, e in imported], dtype=float)
+                    E_mat = np.vstack([E_mat, new_E])
+                    e_vec = np.concatenate([e_vec, new_e])
+                    cut_set.update(_cut_key(E, e) for E, e in imported)
+                    if master is not None:
+                        master.add_cuts(new_E, new_e)
+                    if verbose:
+                        out.append(f"\nImported {len(imported)} cut(s) from other workers")
+            
+            # The first iteration of a worker with a starting point evaluates
+            # x_start instead of the master solution
+            exploring = x_start is not None and iterations == 1
+            
+            # Step 1: Solve master problem
+            if verbose:
+                out.append(f"\nITERATION {iterations}")
+                out.append("-" * 80)
+                out.append(f"Step 1: Solving master problem")
+                # Print master problem formulation
+                print_master_formulation(c, A, b, x_lb, list(zip(E_mat, e_vec)), iterations, out=out)
+            
+            if exploring:
+                # θ is the best lower bound the current cuts give at x_start
+                x = [float(xi) for xi in x_start]
+                theta = float(np.max(e_vec - E_mat @ x)) if len(e_vec) else float('-inf')
+                master_result = {'x': x, 'theta': theta, 'objective': float(np.dot(c, x)) + theta}
+            elif warm_start:
+                master_result = master.solve()
             else:
-                print(f"\nCONVERGED: |w - θ| = {abs(gap):.10f} ≤ {tolerance}")
-            converged = True
-        else:
-            # Add optimality cut
-            cuts.append((sub_results['total_E'], sub_results['total_e']))
+                x, theta, objective = master_problem_fast.solve(E_mat, e_vec, x_lb, c, A, b)
+                master_result = {'x': x, 'theta': theta, 'objective': objective}
+            x = master_result['x']
+            theta = master_result['theta']
+            
+            if verbose:
+                out.append(f"Master problem solution:")
+                out.append(f"  x = [{', '.join(map(_FMT6, x))}]")
+                out.append(f"  θ = {theta:.6f}")
+                out.append(f"  Master objective = {master_result['objective']:.6f}")
+            
+            # Step 3: Solve subproblems
             if verbose:
-                print(f"\nGAP NOT CLOSED: w - θ = {gap:.6f}")
-                cut_terms = [f"{sub_results['total_E'][j]:.4f}*x{j+1}" for j in range(len(sub_results['total_E'])) if abs(sub_results['total_E'][j]) > 1e-10]
-                if cut_terms:
-                    cut_str = f"Adding cut: {' + '.join(cut_terms)} + θ ≥ {sub_results['total_e']:.4f}"
-                else:
-                    cut_str = f"Adding cut: θ ≥ {sub_results['total_e']:.4f}"
-                print(cut_str)
-                print("-" * 80)
+                out.append(f"\nStep 3: Solving subproblems")
+            
+            sub_results = solve_all_subproblems(x, scenarios, iterations, executor=executor, batched=batched,
+                                                scenario_dicts=scenario_dicts)
+            w = sub_results['total_w']
+            
+            # Print detailed subproblem information
+            if verbose:
+                for i, (scenario, result) in enumerate(zip(scenario_dicts, sub_results['scenario_results'])):
+                    print_subproblem_formulation(x, scenario, result, i+1, out=out)
+                
+                # Print combined results
+                print_combined_results(sub_results, iterations, out=out)
+            
+            # Store iteration history
+            history[iterations - 1] = (
+                x[0], x[1], theta, w, w - theta,
+                master_result['objective'], sub_results['total_objective']
+            )
+            
+            # Check if this cut would be a duplicate
+            cut_key = _cut_key(sub_results['total_E'], sub_results['total_e'])
+            is_duplicate = cut_key in cut_set
+            
+            # Check optimality: |w - θ| ≤ tolerance (only meaningful when x came
+            # from the master; a starting point just contributes its cut)
+            gap = w - theta
+            if not exploring and (abs(gap) <= tolerance or is_duplicate):
+                if verbose:
+                    if is_duplicate:
+                        out.append(f"\nDuplicate cut detected - stopping algorithm")
+                    else:
+                        out.append(f"\nCONVERGED: |w - θ| = {abs(gap):.10f} ≤ {tolerance}")
+                converged = True
+                if stop_event is not None:
+                    stop_event.set()
+            elif not is_duplicate:
+                # Add optimality cut
+                new_E = np.asarray(sub_results['total_E'], dtype=float).reshape(1, -1)
+                new_e = np.array([sub_results['total_e']], dtype=float)
+                E_mat = np.vstack([E_mat, new_E])
+                e_vec = np.concatenate([e_vec, new_e])
+                cut_set.add(cut_key)
+                if master is not None:
+                    master.add_cuts(new_E, new_e)
+                if shared_cuts is not None:
+                    shared_cuts.append((tuple(new_E[0].tolist()), float(new_e[0])))
+                if verbose:
+                    out.append(f"\nGAP NOT CLOSED: w - θ = {gap:.6f}")
+                    cut_terms = _cut_terms(sub_results['total_E'])
+                    if cut_terms:
+                        cut_str = f"Adding cut: {' + '.join(cut_terms)} + θ ≥ {sub_results['total_e']:.4f}"
+                    else:
+                        cut_str = f"Adding cut: θ ≥ {sub_results['total_e']:.4f}"
+                    out.append(cut_str)
+                    out.append("-" * 80)
+            
+            if out:
+                sys.stdout.write("\n".join(out) + "\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     # Calculate final objective: first-stage cost + expected second-stage cost
     final_objective = sum(c[i] * x[i] for i in range(len(c))) + sub_results['total_objective']
     
     if verbose:
-        print("\n" + "="*80)
-        print("L-SHAPED METHOD SUMMARY")
-        print("="*80)
+        out = []
+        out.append("\n" + "="*80)
+        out.append("L-SHAPED METHOD SUMMARY")
+        out.append("="*80)
         
         if converged:
-            print(f"Successfully converged in {iterations} iterations.")
+            out.append(f"Successfully converged in {iterations} iterations.")
         else:
-            print(f"Maximum iterations ({max_iterations}) reached without convergence.")
+            out.append(f"Maximum iterations ({max_iterations}) reached without convergence.")
+        
+        out.append(f"\nFinal solution:")
+        out.append(f"  x = [{', '.join(map(_FMT6, x))}]")
+        out.append(f"  First-stage cost = {sum(c[i] * x[i] for i in range(len(c))):.6f}")
+        out.append(f"  Expected second-stage cost = {sub_results['total_objective']:.6f}")
+        out.append(f"  Total objective = {final_objective:.6f}")
         
-        print(f"\nFinal solution:")
-        print(f"  x = [{', '.join([f'{xi:.6f}' for xi in x])}]")
-        print(f"  First-stage cost = {sum(c[i] * x[i] for i in range(len(c))):.6f}")
-        print(f"  Expected second-stage cost = {sub_results['total_objective']:.6f}")
-        print(f"  Total objective = {final_objective:.6f}")
+        out.append("\nConvergence history:")
+        out.append("-" * 100)
+        out.append(f"{'Iter':^5} | {'x1':^15} | {'x2':^15} | {'theta':^15} | {'w':^15} | {'gap':^15}")
+        out.append("-" * 100)
         
-        print("\nConvergence history:")
-        print("-" * 100)
-        print(f"{'Iter':^5} | {'x1':^15} | {'x2':^15} | {'theta':^15} | {'w':^15} | {'gap':^15}")
-        print("-" * 100)
+        for i, iter_info in enumerate(history[:iterations], start=1):
+            out.append(f"{i:^5} | {iter_info['x1']:^15.6f} | {iter_info['x2']:^15.6f} | {iter_info['theta']:^15.6f} | {iter_info['w']:^15.6f} | {iter_info['gap']:^15.6f}")
         
-        for iter_info in history:
-            iter_x = iter_info['x']
-            print(f"{iter_info['iteration']:^5} | {iter_x[0]:^15.6f} | {iter_x[1]:^15.6f} | {iter_info['theta']:^15.6f} | {iter_info['w']:^15.6f} | {iter_info['gap']:^15.6f}")
+        sys.stdout.write("\n".join(out) + "\n")
     
     return {
         'x': x,
@@ -268,5 +421,46 @@ def run_l_shaped_method(max_iterations=100, tolerance=1e-6, verbose=True):
         'objective': final_objective,
         'iterations': iterations,
         'converged': converged,
-        'history': history
+        'history': history[:iterations].copy()  # Release the unused preallocated rows
     }
+
+def run_async_l_shaped(starting_points, max_iterations=100, tolerance=1e-6):
+    """
+    Run several L-shaped workers in parallel processes that share their cuts.
+    
+    Every worker starts from its own point, and all optimality cuts go into a
+    common pool, so each worker's master benefits from the cuts found by the
+    others. The first worker to converge stops the rest.
+    
+    Parameters:
+    -----------
+    starting_points : list
+        First stage decisions each worker evaluates first; None lets that
+        worker start from the master solution
+    max_iterations : int
+        Maximum number of iterations per worker
+    tolerance : float
+        Convergence tolerance
+    
+    Returns:
+    --------
+    dict
+        Result of the best converged worker (of the best worker if none
+        converged), in the format of run_l_shaped_method, with the results of
+        all workers added under 'worker_results'
+    """
+    with multiprocessing.Manager() as manager:
+        shared_cuts = manager.list()
+        stop_event = manager.Event()
+        with ProcessPoolExecutor(max_workers=len(starting_points)) as pool:
+            futures = [
+                pool.submit(run_l_shaped_method, max_iterations, tolerance, False,
+                            shared_cuts=shared_cuts, stop_event=stop_event, x_start=x_start)
+                for x_start in starting_points
+            ]
+            worker_results = [future.result() for future in futures]
+    
+    converged = [result for result in worker_results if result['converged']]
+    best = dict(min(converged or worker_results, key=lambda result: result['objective']))
+    best['worker_results'] = worker_results
+    return best
@@ -1,11 +1,20 @@
 """
 This module implements the master problem for the L-shaped method.
 """
-import pyomo.environ as pyo
+import highspy
+import numpy as np
 
-def solve_master_problem(c, A, b, x_lb, cuts=None):
+class MasterProblem:
     """
-    Solve the master problem with current optimality cuts.
+    Persistent master problem for the L-shaped method.
+    
+    The HiGHS model is built once with the first-stage data. Each optimality
+    cut is appended as a new row with add_cut(), and solve() re-runs the
+    simplex from the previous optimal basis, so later iterations only need a
+    few pivots to absorb the new cut. Presolve is switched off so the warm
+    start is not discarded, and the dual simplex is used: a new cut leaves
+    the old basis dual feasible and only primal infeasible in the new row,
+    which is exactly where the dual simplex restarts from.
     
     Parameters:
     -----------
@@ -17,99 +26,144 @@ def solve_master_problem(c, A, b, x_lb, cuts=None):
         First stage RHS
     x_lb : list
         Lower bounds for first stage variables
-    cuts : list
-        List of optimality cuts, each represented as a tuple (E, e)
-    
-    Returns:
-    --------
-    dict
-        Contains the optimal solution and objective value
     """
-    # Create a concrete model
-    model = pyo.ConcreteModel(name="Master_Problem")
-    
-    # Define indices
-    model.n = range(len(c))
-    model.m = range(len(A))
     
-    # Define variables
-    model.x = pyo.Var(model.n, domain=pyo.NonNegativeReals)
-    
-    # Set lower bounds
-    for i in model.n:
-        model.x[i].setlb(x_lb[i])
-    
-    # Only include theta if there are cuts
-    if cuts and len(cuts) > 0:
-        model.theta = pyo.Var(domain=pyo.Reals)
-        # Define objective with theta
-        model.obj = pyo.Objective(
-            expr=sum(c[i] * model.x[i] for i in model.n) + model.theta,
-            sense=pyo.minimize
-        )
-    else:
-        # Without cuts, no need for theta
-        model.obj = pyo.Objective(
-            expr=sum(c[i] * model.x[i] for i in model.n),
-            sense=pyo.minimize
+    def __init__(self, c, A, b, x_lb):
+        self.c = list(c)
+        self.x_lb = list(x_lb)
+        self.num_vars = len(c)
+        self.has_theta = False
+        
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue('output_flag', False)
+        self.highs.setOptionValue('presolve', 'off')
+        self.highs.setOptionValue('solver', 'simplex')
+        self.highs.setOptionValue('simplex_strategy', 1)  # 1 = dual simplex
+        inf = highspy.kHighsInf
+        
+        # Columns: x with its lower bounds
+        self.highs.addCols(
+            self.num_vars,
+            np.asarray(c, dtype=float),
+            np.asarray(x_lb, dtype=float),
+            np.full(self.num_vars, inf),
+            0, np.array([], dtype=np.int32), np.array([], dtype=np.int32), np.array([])
         )
-    
-    # Define first-stage constraints
-    model.constraints = pyo.ConstraintList()
-    for i in model.m:
-        model.constraints.add(
-            sum(A[i][j] * model.x[j] for j in model.n) <= b[i]
+        
+        # Rows: first-stage constraints Ax <= b
+        matrix = np.asarray(A, dtype=float)
+        nz_rows, nz_cols = np.nonzero(matrix)
+        self.highs.addRows(
+            len(A),
+            np.full(len(A), -inf),
+            np.asarray(b, dtype=float),
+            len(nz_rows),
+            np.searchsorted(nz_rows, np.arange(len(A))).astype(np.int32),
+            nz_cols.astype(np.int32),
+            matrix[nz_rows, nz_cols]
         )
     
-    # Add optimality cuts
-    if cuts and len(cuts) > 0:
-        model.cuts = pyo.ConstraintList()
-        for E, e in cuts:
-            model.cuts.add(
-                sum(E[j] * model.x[j] for j in model.n) + model.theta >= e
-            )
+    def add_cut(self, E, e):
+        """
+        Add the optimality cut Ex + theta >= e.
+        """
+        self.add_cuts(np.asarray(E, dtype=float).reshape(1, -1), np.array([e], dtype=float))
     
-    # Solve the model
-    solver = pyo.SolverFactory('glpk')
-    results = solver.solve(model, tee=False)
-    
-    # Check if the model was solved successfully
-    if results.solver.status != pyo.SolverStatus.ok or \
-       results.solver.termination_condition != pyo.TerminationCondition.optimal:
-        print(f"Warning: Solver status: {results.solver.status}, termination condition: {results.solver.termination_condition}")
-        return {
-            'x': [x_lb[i] for i in range(len(c))],
-            'theta': float('-inf'),
-            'objective': sum(c[i] * x_lb[i] for i in range(len(c))),
-            'status': str(results.solver.termination_condition)
-        }
+    def add_cuts(self, E_mat, e_vec):
+        """
+        Add a batch of optimality cuts E_mat[k] x + theta >= e_vec[k] in one call.
+        
+        theta is only added to the model with the first cut; without cuts it
+        would be unbounded below.
+        """
+        inf = highspy.kHighsInf
+        if not self.has_theta:
+            self.highs.addCol(1.0, -inf, inf, 0, np.array([], dtype=np.int32), np.array([]))
+            self.has_theta = True
+        
+        # Dense rows [E, 1] for (x, theta)
+        num_cuts = len(e_vec)
+        rows = np.hstack([np.asarray(E_mat, dtype=float), np.ones((num_cuts, 1))])
+        width = self.num_vars + 1
+        self.highs.addRows(
+            num_cuts,
+            np.asarray(e_vec, dtype=float),
+            np.full(num_cuts, inf),
+            num_cuts * width,
+            (np.arange(num_cuts) * width).astype(np.int32),
+            np.tile(np.arange(width, dtype=np.int32), num_cuts),
+            rows.ravel()
+        )
     
-    # Extract solution information
-    try:
-        x_values = [model.x[i].value for i in model.n]
+    def solve(self):
+        """
+        Solve the master problem with the cuts added so far.
+        
+        Returns:
+        --------
+        dict
+            Contains the optimal solution and objective value
+        """
+        c = self.c
+        x_lb = self.x_lb
+        num_vars = self.num_vars
+        
+        self.highs.run()
+        model_status = self.highs.getModelStatus()
+        
+        # Check if the model was solved successfully
+        if model_status != highspy.HighsModelStatus.kOptimal:
+            status = self.highs.modelStatusToString(model_status)
+            print(f"Warning: Solver status: {status}")
+            return {
+                'x': [x_lb[i] for i in range(num_vars)],
+                'theta': float('-inf'),
+                'objective': sum(c[i] * x_lb[i] for i in range(num_vars)),
+                'status': status
+            }
+        
+        # Extract solution information
+        col_value = self.highs.getSolution().col_value
+        x_values = list(col_value[:num_vars])
         
         # Get theta value if it exists
-        if cuts and len(cuts) > 0:
-            theta_value = model.theta.value
-        else:
-            theta_value = float('-inf')
+        theta_value = col_value[num_vars] if self.has_theta else float('-inf')
         
         # Calculate objective
-        objective_value = sum(c[i] * x_values[i] for i in range(len(c)))
-        if cuts and len(cuts) > 0:
+        objective_value = sum(c[i] * x_values[i] for i in range(num_vars))
+        if self.has_theta:
             objective_value += theta_value
-            
-    except Exception as e:
-        # Fallback in case of errors
-        print(f"Warning: Could not retrieve solution values properly. Error: {e}")
-        print("Using fallback method.")
-        x_values = [x_lb[i] for i in range(len(c))]
-        theta_value = float('-inf')
-        objective_value = sum(c[i] * x_lb[i] for i in range(len(c)))
+        
+        return {
+            'x': x_values,
+            'theta': theta_value,
+            'objective': objective_value,
+            'status': 'optimal'
+        }
+
+def solve_master_problem(c, A, b, x_lb, cuts=None):
+    """
+    Solve the master problem with current optimality cuts.
+    
+    Parameters:
+    -----------
+    c : list
+        First stage cost coefficients
+    A : list of lists
+        First stage constraint matrix
+    b : list
+        First stage RHS
+    x_lb : list
+        Lower bounds for first stage variables
+    cuts : list
+        List of optimality cuts, each represented as a tuple (E, e)
     
-    return {
-        'x': x_values,
-        'theta': theta_value,
-        'objective': objective_value,
-        'status': str(results.solver.termination_condition)
-    }
\ No newline at end of file
+    Returns:
+    --------
+    dict
+        Contains the optimal solution and objective value
+    """
+    master = MasterProblem(c, A, b, x_lb)
+    for E, e in (cuts or []):
+        master.add_cut(E, e)
+    return master.solve()
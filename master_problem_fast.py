@@ -0,0 +1,80 @@
+"""
+This module implements a specialized master problem solver for the L-shaped method.
+
+The first stage of this problem always has two variables and one
+constraint, so the master LP is written out directly as arrays for
+scipy's HiGHS interface instead of being built row by row.
+"""
+import numpy as np
+from scipy.optimize import linprog
+
+def solve(cuts_E, cuts_e, x_lb, c, A, b):
+    """
+    Solve the master problem for two first stage variables and one constraint.
+    
+    min  c[0]*x1 + c[1]*x2 + θ
+    s.t. A[0][0]*x1 + A[0][1]*x2 ≤ b[0]
+         cuts_E[k] x + θ ≥ cuts_e[k]   for every cut k
+         x ≥ x_lb
+    
+    Parameters:
+    -----------
+    cuts_E : numpy.ndarray, shape (k, 2)
+        Cut coefficients E, one row per cut
+    cuts_e : numpy.ndarray, shape (k,)
+        Cut constants e
+    x_lb : list
+        Lower bounds for first stage variables
+    c : list
+        First stage cost coefficients
+    A : list of lists
+        First stage constraint matrix (one row)
+    b : list
+        First stage RHS (one entry)
+    
+    Returns:
+    --------
+    tuple
+        (x, theta, objective); theta is -inf when there are no cuts yet. If
+        the LP cannot be solved a warning is printed and x falls back to x_lb
+    """
+    num_cuts = len(cuts_e)
+    
+    if num_cuts == 0:
+        # Without cuts θ would be unbounded below, so leave it out
+        res = linprog(
+            np.array([c[0], c[1]], dtype=float),
+            A_ub=np.array([[A[0][0], A[0][1]]], dtype=float),
+            b_ub=np.array([b[0]], dtype=float),
+            bounds=[(x_lb[0], None), (x_lb[1], None)],
+            method='highs-ds'
+        )
+        if res.status != 0:
+            return _fallback(res, x_lb, c)
+        return res.x.tolist(), float('-inf'), float(res.fun)
+    
+    # Variables (x1, x2, θ); the cuts are flipped to ≤ rows: -E x - θ ≤ -e
+    c_lp = np.array([c[0], c[1], 1.0])
+    A_ub = np.vstack([
+        [A[0][0], A[0][1], 0.0],
+        -np.hstack([np.asarray(cuts_E, dtype=float), np.ones((num_cuts, 1))])
+    ])
+    b_ub = np.concatenate([[b[0]], -np.asarray(cuts_e, dtype=float)])
+    
+    res = linprog(
+        c_lp,
+        A_ub=A_ub,
+        b_ub=b_ub,
+        bounds=[(x_lb[0], None), (x_lb[1], None), (None, None)],
+        method='highs-ds'
+    )
+    if res.status != 0:
+        return _fallback(res, x_lb, c)
+    return res.x[:2].tolist(), float(res.x[2]), float(res.fun)
+
+def _fallback(res, x_lb, c):
+    """
+    Result returned when linprog fails, matching MasterProblem.solve.
+    """
+    print(f"Warning: Solver status: {res.message}")
+    return [x_lb[0], x_lb[1]], float('-inf'), c[0] * x_lb[0] + c[1] * x_lb[1]
@@ -1,6 +1,57 @@
 """
 This module contains the problem data and helper functions for the stochastic programming problem.
 """
+from collections import namedtuple
+
+import numpy as np
+from numba import njit
+
+class ScenarioSet(namedtuple('ScenarioSet', ['probs', 'q', 'd', 'H', 'T', 'W'])):
+    """
+    Scenario data in struct-of-arrays form.
+    
+    Fields:
+    -------
+    probs : numpy.ndarray, shape (S,)
+        Scenario probabilities
+    q : numpy.ndarray, shape (S, 2)
+        Second stage cost coefficients (q1, q2)
+    d : numpy.ndarray, shape (S, 2)
+        Demands (d1, d2), used as upper bounds on y
+    H : numpy.ndarray, shape (S, m)
+        RHS constants h of each scenario
+    T : numpy.ndarray, shape (S, m, n)
+        Technology matrix of each scenario
+    W : numpy.ndarray, shape (S, 2, 2)
+        Recourse matrix of each scenario
+    """
+    __slots__ = ()
+    
+    def as_dicts(self):
+        """
+        Return the scenarios as a list of dicts for the subproblem solver.
+        
+        Each dict holds the probability and the float64 arrays h_np, T_np,
+        q_np, ub_np and W_np (views into the set, so nothing is copied).
+        Build the list once per run and reuse it across iterations.
+        """
+        return [
+            {
+                'probability': float(self.probs[k]),
+                'h_np': self.H[k],
+                'T_np': self.T[k],
+                'q_np': self.q[k],
+                'ub_np': self.d[k],
+                'W_np': self.W[k]
+            }
+            for k in range(len(self.probs))
+        ]
+    
+    def rhs_all(self, x):
+        """
+        Return h - Tx for every scenario at once, shape (S, m).
+        """
+        return self.H - np.einsum('sij,j->si', self.T, np.asarray(x, dtype=np.float64))
 
 def get_problem_data():
     """
@@ -15,33 +66,30 @@ def get_problem_data():
     c = [100, 150]
     
     # First stage constraints
-    A = [[1, 1]]
+    A = np.asarray([[1, 1]], dtype=np.float64)
     b = [120]
     
     # First stage variable bounds
     x_lb = [40, 20]
     
-    # Define scenarios
-    scenarios = [
-        {
-            'probability': 0.4,
-            'd1': 500,
-            'd2': 100,
-            'q1': -24,
-            'q2': -28,
-            'h': [0, 0, 500, 100],  # RHS constants: [constraint1, constraint2, bound_y1, bound_y2]
-            'T': [[-60, 0], [0, -80], [0, 0], [0, 0]]  # Technology matrix rows for each constraint
-        },
-        {
-            'probability': 0.6,
-            'd1': 300,
-            'd2': 300,
-            'q1': -28,
-            'q2': -32,
-            'h': [0, 0, 300, 300],  # RHS constants: [constraint1, constraint2, bound_y1, bound_y2]
-            'T': [[-60, 0], [0, -80], [0, 0], [0, 0]]  # Technology matrix rows for each constraint
-        }
-    ]
+    # Define scenarios, stored as arrays with one row per scenario
+    scenarios = ScenarioSet(
+        probs=np.array([0.4, 0.6]),
+        q=np.array([[-24.0, -28.0], [-28.0, -32.0]]),  # (q1, q2) per scenario
+        d=np.array([[500.0, 100.0], [300.0, 300.0]]),  # (d1, d2) per scenario
+        # RHS constants: [constraint1, constraint2, bound_y1, bound_y2]
+        H=np.array([[0.0, 0.0, 500.0, 100.0], [0.0, 0.0, 300.0, 300.0]]),
+        # Technology matrix rows for each constraint
+        T=np.array([
+            [[-60.0, 0.0], [0.0, -80.0], [0.0, 0.0], [0.0, 0.0]],
+            [[-60.0, 0.0], [0.0, -80.0], [0.0, 0.0], [0.0, 0.0]]
+        ]),
+        # Recourse matrix: 6y1 + 10y2 ≤ 60x1, 8y1 + 5y2 ≤ 80x2
+        W=np.array([
+            [[6.0, 10.0], [8.0, 5.0]],
+            [[6.0, 10.0], [8.0, 5.0]]
+        ])
+    )
     
     return {
         'c': c,
@@ -66,16 +114,21 @@ def calculate_rhs(h, T, x):
     
     Returns:
     --------
-    list
+    numpy.ndarray
         h - Tx values
     """
-    result = []
-    for i in range(len(h)):
-        value = h[i]
-        for j in range(len(x)):
-            value -= T[i][j] * x[j]
-        result.append(value)
-    return result
+    # h and T are already float64 arrays when they come from get_problem_data,
+    # so asarray is a no-op there and only converts plain lists
+    return _calculate_rhs(
+        np.asarray(h, dtype=np.float64),
+        np.asarray(T, dtype=np.float64),
+        np.asarray(x, dtype=np.float64)
+    )
+
+@njit(cache=True)
+def _calculate_rhs(h, T, x):
+    """Compiled kernel of calculate_rhs."""
+    return h - T @ x
 
 def calculate_optimality_components(pi, h, T, probability):
     """
@@ -84,7 +137,7 @@ def calculate_optimality_components(pi, h, T, probability):
     Parameters:
     -----------
     pi : list
-        Simplex multipliers (dual values)
+        Simplex multipliers (dual values), one per entry of h
     h : list
         RHS constants
     T : list of lists
@@ -97,24 +150,20 @@ def calculate_optimality_components(pi, h, T, probability):
     tuple
         (e, E) values for the cut
     """
-    # Make sure pi has the correct length
-    if len(pi) != len(h):
-        pi_adjusted = pi + [0] * (len(h) - len(pi))
-    else:
-        pi_adjusted = pi
+    pi = np.asarray(pi, dtype=np.float64)
+    h = np.asarray(h, dtype=np.float64)
     
-    # Calculate e = π^T · h
-    e = 0
-    for i in range(len(h)):
-        e += pi_adjusted[i] * h[i]
-    e *= probability
-    
-    # Calculate E = π^T · T
-    E = [0] * len(T[0])
-    for j in range(len(E)):
-        for i in range(len(T)):
-            if i < len(pi_adjusted):  # Safety check
-                E[j] += pi_adjusted[i] * T[i][j]
-        E[j] *= probability
+    # The subproblem solvers return one multiplier per row of h
+    if len(pi) != len(h):
+        raise ValueError(f"pi has {len(pi)} entries but h has {len(h)}")
     
-    return e, E
\ No newline at end of file
+    e, E = _optimality_components(pi, h, np.asarray(T, dtype=np.float64), probability)
+    return float(e), E
+
+@njit(cache=True)
+def _optimality_components(pi, h, T, probability):
+    """Compiled kernel of calculate_optimality_components."""
+    # e = p · π^T h and E = p · π^T T
+    e = probability * (pi @ h)
+    E = probability * (pi @ T)
+    return e, E
@@ -1,55 +1,15 @@
 """
 This module implements the subproblem solvers for the L-shaped method.
 """
-from SimplexMultipliers import solve_lp_with_duals
+from SimplexMultipliers import solve_2x2_subproblem, solve_many_lps
 from stochastic_problem import calculate_rhs, calculate_optimality_components
 import numpy as np
+from scipy.optimize import linprog
 
-def transform_dual_vector(raw_pi, num_constraints, num_variables, y_values, upper_bounds):
-    """
-    Transform the raw dual vector to the format expected by the L-shaped method.
-    Generic implementation without any special case handling.
-    
-    Parameters:
-    -----------
-    raw_pi : list
-        Raw dual vector from the solver
-    num_constraints : int
-        Number of constraints
-    num_variables : int
-        Number of variables
-    y_values : list
-        Solution values for variables
-    upper_bounds : list
-        Upper bounds for variables
-    """
-    # Initialize result vector
-    result = [0] * (num_constraints + num_variables)
-    
-    # Copy constraint duals directly
-    for i in range(min(num_constraints, len(raw_pi))):
-        result[i] = raw_pi[i]
-    
-    # Process variable bounds - generic approach
-    # In the raw vector, upper bound duals start at position num_constraints + num_variables
-    ub_start = num_constraints + num_variables
-    
-    # For each variable, check if it's at upper bound
-    for i in range(num_variables):
-        if abs(y_values[i] - upper_bounds[i]) < 1e-6:
-            # Variable is at upper bound, look for a non-zero dual in the raw vector
-            for j in range(num_constraints, len(raw_pi)):
-                if abs(raw_pi[j]) > 1e-6:
-                    # Found a non-zero dual value, assume it corresponds to this variable
-                    # In L-shaped method format, the upper bound dual has negative sign
-                    result[num_constraints + i] = -abs(raw_pi[j])
-                    # Remove this value so it's not used again
-                    raw_pi[j] = 0
-                    break
-    
-    return result
+# Second stage variables are nonnegative in every scenario
+_Y_LOWER_BOUNDS = np.zeros(2)
 
-def solve_subproblem(x, scenario, iteration_num):
+def solve_subproblem(x, scenario, iteration_num, rhs=None):
     """
     Solve a second-stage subproblem for given first-stage decisions and scenario parameters.
     
@@ -58,71 +18,83 @@ def solve_subproblem(x, scenario, iteration_num):
     x : list
         First stage decision values
     scenario : dict
-        Scenario parameters
+        Scenario parameters, as returned by ScenarioSet.as_dicts
     iteration_num : int
         Current iteration number
+    rhs : numpy.ndarray, optional
+        Precomputed h - Tx of this scenario (see ScenarioSet.rhs_all)
     
     Returns:
     --------
     dict
         Contains solution information including objective and dual values
     """
-    # Extract scenario data
-    d1 = scenario['d1']
-    d2 = scenario['d2']
-    q1 = scenario['q1']
-    q2 = scenario['q2']
-    h = scenario['h']
-    T = scenario['T']
-    probability = scenario['probability']
+    # Extract scenario data (precomputed float64 arrays, see ScenarioSet.as_dicts)
+    W = scenario['W_np']
+    var_upper_bounds = scenario['ub_np']
     
     # Calculate right-hand side: h - Tx
-    rhs = calculate_rhs(h, T, x)
+    if rhs is None:
+        rhs = calculate_rhs(scenario['h_np'], scenario['T_np'], x)
+    
+    # Solve the 2-variable LP in closed form by vertex enumeration; only the
+    # first two elements of rhs are actual constraints
+    solution = solve_2x2_subproblem(scenario['q_np'], W, rhs[:2], var_upper_bounds)
+    if solution is not None:
+        y_values, objective_value, row_duals, col_duals = solution
+        # A negative multiplier can only come from an active upper bound line
+        ub_duals = np.minimum(col_duals, 0.0)
+    else:
+        # No optimal vertex found, solve with HiGHS directly
+        res = linprog(
+            scenario['q_np'],
+            A_ub=W,
+            b_ub=rhs[:2],
+            bounds=list(zip(_Y_LOWER_BOUNDS, var_upper_bounds)),
+            method='highs-ds'
+        )
+        if res.status != 0:
+            raise ValueError(f"Subproblem could not be solved optimally: {res.message}")
+        y_values = res.x.tolist()
+        objective_value = float(res.fun)
+        row_duals = res.ineqlin.marginals
+        ub_duals = res.upper.marginals
+    
+    # The solver duals already follow the L-shaped sign convention (≤ 0 for
+    # the constraints and upper bounds), so pi is just their concatenation
+    pi_vector = np.concatenate([row_duals, ub_duals]) + 0.0  # Normalize -0.0
+    
+    return _subproblem_result(x, scenario, rhs, y_values, objective_value, pi_vector)
+
+def _subproblem_result(x, scenario, rhs, y_values, objective_value, pi_vector):
+    """
+    Turn the solution of a scenario subproblem into its cut components.
     
-    # Setup the constraint matrix (W)
-    W = [
-        [6, 10],  # 6y1 + 10y2 ≤ 60x1
-        [8, 5]    # 8y1 + 5y2 ≤ 80x2
-    ]
+    Parameters:
+    -----------
+    x : list
+        First stage decision values
+    scenario : dict
+        Scenario parameters, as returned by ScenarioSet.as_dicts
+    rhs : numpy.ndarray
+        Right-hand side h - Tx of the scenario
+    y_values : list
+        Optimal second stage decisions
+    objective_value : float
+        Optimal objective value of the subproblem
+    pi_vector : numpy.ndarray
+        Duals of the constraints followed by those of the upper bounds
     
-    # Setup objective coefficients
-    objective_coeffs = [q1, q2]
-    
-    # Variable bounds
-    var_lower_bounds = [0, 0]
-    var_upper_bounds = [d1, d2]
-    
-    # Solve the LP using the provided function
-    result = solve_lp_with_duals(
-        objective_coeffs=objective_coeffs,
-        constraint_matrix=W,
-        constraint_rhs=rhs[:2],  # Only the first two elements are actual constraints
-        var_lower_bounds=var_lower_bounds,
-        var_upper_bounds=var_upper_bounds,
-        problem_name=f"Subproblem_p{probability}"
-    )
-    
-    if result['status'] != 'optimal':
-        raise ValueError(f"Subproblem could not be solved optimally: {result['status']}")
-    
-    # Get solution values
-    y_values = result['variable_values']
-    objective_value = result['objective_value']
-    
-    # Get raw pi vector from solver result
-    raw_pi_vector = result['pi_vector']
-    
-    # Transform the raw pi vector to the expected format
-    pi_vector = transform_dual_vector(
-        raw_pi_vector,
-        num_constraints=2,
-        num_variables=2,
-        y_values=y_values,
-        upper_bounds=var_upper_bounds
-    )
+    Returns:
+    --------
+    dict
+        Contains solution information including objective and dual values
+    """
+    h = scenario['h_np']
+    T = scenario['T_np']
     
     # Calculate components for the optimality cut
-    e, E = calculate_optimality_components(pi_vector, h, T, probability)
+    e, E = calculate_optimality_components(pi_vector, h, T, scenario['probability'])
     
     # Calculate w = e - E*x
     w = e
@@ -135,47 +107,112 @@ def solve_subproblem(x, scenario, iteration_num):
         'pi_vector': pi_vector,
         'e': e,
         'E': E,
-        'w': w
+        'w': w,
+        'rhs': rhs
     }
 
-def solve_all_subproblems(x, scenarios, iteration_num):
+def solve_subproblems_batched(x, scenario_dicts, rhs_all=None):
+    """
+    Solve all scenario subproblems as one block-diagonal LP.
+    
+    Parameters:
+    -----------
+    x : list
+        First stage decision values
+    scenario_dicts : list of dict
+        Scenario parameters, as returned by ScenarioSet.as_dicts
+    rhs_all : numpy.ndarray, optional
+        Precomputed h - Tx of every scenario, one row per scenario
+    
+    Returns:
+    --------
+    list of dict
+        One result per scenario, in the format of solve_subproblem
+    """
+    if rhs_all is None:
+        rhs_all = [calculate_rhs(scenario['h_np'], scenario['T_np'], x) for scenario in scenario_dicts]
+    rhs_list = list(rhs_all)
+    problems = [
+        {
+            'objective_coeffs': scenario['q_np'],
+            'constraint_matrix': scenario['W_np'],
+            'constraint_rhs': rhs[:2],
+            'var_lower_bounds': _Y_LOWER_BOUNDS,
+            'var_upper_bounds': scenario['ub_np']
+        }
+        for scenario, rhs in zip(scenario_dicts, rhs_list)
+    ]
+    lp_results = solve_many_lps(problems)
+    
+    results = []
+    for scenario, rhs, result in zip(scenario_dicts, rhs_list, lp_results):
+        if result['status'] != 'optimal':
+            raise ValueError(f"Subproblem could not be solved optimally: {result['status']}")
+        
+        # pi_vector is already [row duals, upper bound duals] as in solve_subproblem
+        results.append(_subproblem_result(
+            x, scenario, rhs, result['variable_values'], result['objective_value'],
+            result['pi_vector']
+        ))
+    return results
+
+def solve_all_subproblems(x, scenarios, iteration_num, executor=None, batched=False,
+                          scenario_dicts=None):
     """
     Solve all scenario subproblems and aggregate the results.
     
+    The scenarios are independent, so they are dispatched to the worker
+    processes of executor when one is given.
+    
     Parameters:
     -----------
     x : list
         First stage decision values
-    scenarios : list
-        List of scenario data
+    scenarios : ScenarioSet
+        Scenario data
     iteration_num : int
         Current iteration number
+    executor : concurrent.futures.Executor, optional
+        Pool used to solve the scenarios in parallel (None solves them serially)
+    batched : bool, optional
+        Solve all scenarios as one block-diagonal LP instead (executor is
+        then not used)
+    scenario_dicts : list of dict, optional
+        scenarios.as_dicts(), built once by the caller so it is not rebuilt
+        every iteration
     
     Returns:
     --------
     dict
         Contains aggregated results
     """
-    total_e = 0
-    total_E = [0] * len(x)
-    total_objective = 0
-    
-    results = []
-    
-    for scenario in scenarios:
-        result = solve_subproblem(x, scenario, iteration_num)
-        results.append(result)
-        
-        total_e += result['e']
-        for i in range(len(x)):
-            total_E[i] += result['E'][i]
-        
-        total_objective += scenario['probability'] * result['objective_value']
+    if scenario_dicts is None:
+        scenario_dicts = scenarios.as_dicts()
+    
+    # Right-hand sides of all scenarios in one vectorized pass
+    rhs_all = scenarios.rhs_all(x)
+    
+    if batched:
+        results = solve_subproblems_batched(x, scenario_dicts, rhs_all)
+    elif executor is None:
+        results = [solve_subproblem(x, scenario, iteration_num, rhs)
+                   for scenario, rhs in zip(scenario_dicts, rhs_all)]
+    else:
+        futures = [executor.submit(solve_subproblem, x, scenario, iteration_num, rhs)
+                   for scenario, rhs in zip(scenario_dicts, rhs_all)]
+        results = [future.result() for future in futures]
+    
+    # Stack the per-scenario components and reduce them in one pass
+    e_s = np.array([result['e'] for result in results])
+    E_s = np.array([result['E'] for result in results])
+    obj_s = np.array([result['objective_value'] for result in results])
+    
+    total_e = float(e_s.sum())
+    total_E = E_s.sum(axis=0)
+    total_objective = float(scenarios.probs @ obj_s)
     
     # Calculate w = e - Ex
-    total_w = total_e
-    for i in range(len(x)):
-        total_w -= total_E[i] * x[i]
+    total_w = total_e - float(total_E @ np.asarray(x, dtype=np.float64))
     
     return {
         'scenario_results': results,
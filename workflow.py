@@ -3,7 +3,7 @@ L-Shaped Method Implementation: Detailed Workflow
 
 This file provides a comprehensive explanation of the L-shaped method implementation
 for solving two-stage stochastic linear programs. It includes algorithm steps,
-examples, and insights into the transformation of dual values.
+examples, and insights into the dual values used for the cuts.
 
 Original Problem:
 min 100x1 + 150x2 + Eξ(q1y1 + q2y2)
@@ -20,12 +20,19 @@ where ξ = (d1, d2, q1, q2) takes the values:
     (500, 100, -24, -28), with probability 0.4 (Scenario 1)
     (300, 300, -28, -32), with probability 0.6 (Scenario 2)
 """
+import sys
 
-def algorithm_overview():
-    """
-    Overview of the L-shaped method algorithm.
-    """
-    print("""
+# Opening and closing banners of the printed document
+_RULE = "=" * 80
+_TOP = f"\n{_RULE}\n{' L-SHAPED METHOD IMPLEMENTATION: DETAILED WORKFLOW '.center(80, '=')}\n{_RULE}\n\n"
+_BOT = f"\n{_RULE}\n{' END OF WORKFLOW DOCUMENTATION '.center(80, '=')}\n{_RULE}\n\n"
+
+# Dashed line between two sections; it is followed by a blank line
+_SECTION_SEP = "\n" + "-" * 80 + "\n"
+
+# Text of each section; the section functions return it as a string so
+# callers can use it without going through stdout
+_OVERVIEW = """
     The L-shaped method follows these main steps:
     
     1. Initialize: Set iteration counter and initialize empty cut collections.
@@ -44,13 +51,15 @@ def algorithm_overview():
     4. Convergence Check:
        - Calculate the actual recourse cost (w) based on current x
        - If |w - θ| ≤ tolerance, stop; otherwise, add a new cut and return to step 2
-    """)
+    """
 
-def detailed_steps():
+def algorithm_overview():
     """
-    Detailed explanation of the implementation steps.
+    Overview of the L-shaped method algorithm.
     """
-    print("""
+    return _OVERVIEW
+
+_DETAILED = """
     Implementation Details:
     
     A. Master Problem (master_problem.py)
@@ -85,16 +94,16 @@ def detailed_steps():
     
     C. Dual Value Processing (Key Challenge)
     ---------------------------------------
-    1. Raw dual values from the solver have this structure:
-       [constraint_dual_1, constraint_dual_2, lb_dual_1, lb_dual_2, ub_dual_1, ub_dual_2]
+    1. The solver returns one dual per constraint row and one per variable:
+       [constraint_dual_1, constraint_dual_2, col_dual_1, col_dual_2]
     
     2. For the L-shaped method, we need them in this format:
-       [constraint_dual_1, constraint_dual_2, ub_dual_1 (negated), ub_dual_2 (negated)]
+       [constraint_dual_1, constraint_dual_2, ub_dual_1, ub_dual_2]
     
-    3. The transformation function handles this generically:
-       - Copies constraint duals directly
-       - For variables at their upper bounds, finds their corresponding dual values
-       - Applies the correct sign (negative for upper bound duals)
+    3. Both already use the same sign convention (≤ 0 for a minimization), so:
+       - Constraint duals are used directly
+       - The upper bound dual of a variable at its upper bound is its column dual
+       - Any other column dual belongs to the lower bound y ≥ 0 and is dropped
     
     D. Optimality Cut Generation
     ---------------------------
@@ -107,13 +116,15 @@ def detailed_steps():
        - E = Σ(E_k)
     
     3. Add the cut E*x + θ ≥ e to the master problem
-    """)
+    """
 
-def iteration_examples():
+def detailed_steps():
     """
-    Examples of the first two iterations of the algorithm.
+    Detailed explanation of the implementation steps.
     """
-    print("""
+    return _DETAILED
+
+_EXAMPLES = """
     Example of First Two Iterations:
     ===============================
     
@@ -124,14 +135,14 @@ def iteration_examples():
     Scenario 1 (p=0.4):
     - Solve min -24y₁ - 28y₂ s.t. constraints with x = (40, 20)
     - y* = (137.5, 100), obj = -6100
-    - Transformed duals: π = (0, -3, 0, -13)
+    - Duals: π = (0, -3, 0, -13)
     - e₁ = 0.4 * π^T * h₁ = 0.4 * (-1300) = -520
     - E₁ = 0.4 * π^T * T₁ = 0.4 * (0, 240) = (0, 96)
     
     Scenario 2 (p=0.6):
     - Solve min -28y₁ - 32y₂ s.t. constraints with x = (40, 20)
     - y* = (80, 192), obj = -8384
-    - Transformed duals: π = (-2.32, -1.76, 0, 0)
+    - Duals: π = (-2.32, -1.76, 0, 0)
     - e₂ = 0.6 * π^T * h₂ = 0.6 * (0) = 0
     - E₂ = 0.6 * π^T * T₂ = 0.6 * (139.2, 140.8) = (83.52, 84.48)
     
@@ -149,14 +160,14 @@ def iteration_examples():
     Scenario 1 (p=0.4):
     - Solve min -24y₁ - 28y₂ s.t. constraints with x = (40, 80)
     - y* = (400, 0), obj = -9600
-    - Transformed duals: π = (-4, 0, 0, 0)
+    - Duals: π = (-4, 0, 0, 0)
     - e₁ = 0.4 * π^T * h₁ = 0.4 * (0) = 0
     - E₁ = 0.4 * π^T * T₁ = 0.4 * (240, 0) = (96, 0)
     
     Scenario 2 (p=0.6):
     - Solve min -28y₁ - 32y₂ s.t. constraints with x = (40, 80)
     - y* = (300, 60), obj = -10320
-    - Transformed duals: π = (-3.2, 0, -8.8, 0)
+    - Duals: π = (-3.2, 0, -8.8, 0)
     - e₂ = 0.6 * π^T * h₂ = 0.6 * (0 + 0 + (-8.8)*300 + 0) = 0.6 * (-2640) = -1584
     - E₂ = 0.6 * π^T * T₂ = 0.6 * (192 + 0 + 0 + 0) = (115.2, 0)
     
@@ -174,56 +185,58 @@ def iteration_examples():
     This discrepancy could be due to special handling in the original calculations
     or a missing step in the lecture slides. Our implementation calculates the true
     sum of the individual E values.
-    """)
+    """
 
-def dual_transformation_explanation():
+def iteration_examples():
     """
-    Detailed explanation of the dual transformation process.
+    Examples of the first two iterations of the algorithm.
     """
-    print("""
-    Dual Value Transformation Details:
-    =================================
+    return _EXAMPLES
+
+_DUAL_TRANSFORMATION = """
+    Dual Value Details:
+    ==================
     
     The most challenging aspect of implementing the L-shaped method is correctly
-    extracting and transforming dual values from the LP solver.
+    extracting the dual values of each subproblem from the LP solver.
     
-    1. Raw Dual Structure:
+    1. Solver Dual Structure:
        - When we solve an LP with constraints and variable bounds, the solver
-         returns dual values for both constraints and bounds.
-       - For example, with 2 constraints and 2 variables, we might get:
-         [constraint1_dual, constraint2_dual, y1_lb_dual, y2_lb_dual, y1_ub_dual, y2_ub_dual]
+         returns one dual value per constraint row and one per variable.
+       - With 2 constraints and 2 variables we get:
+         [constraint1_dual, constraint2_dual] and [y1_col_dual, y2_col_dual]
     
     2. Required Dual Structure for L-shaped Method:
        - The L-shaped method requires a specific format for dual values:
          [constraint1_dual, constraint2_dual, y1_ub_dual, y2_ub_dual]
-       - Note that lower bound duals are omitted, and upper bound duals need a specific sign.
-    
-    3. Transformation Logic:
-       - Copy constraint duals directly (first part of the vector)
-       - Identify which variables are at their upper bounds
-       - For each such variable, find the corresponding non-zero dual value
-       - Properly assign this value (with correct sign) to the right position
-    
-    4. Sign Conventions:
-       - In the dual vector for the L-shaped method, upper bound duals typically
-         have a negative sign relative to the raw values from the solver.
-       - This is why we negate the upper bound dual values during transformation.
-    
-    5. Example Scenario 2, Iteration 2:
-       - Raw vector: [-3.2, 0.0, 0, 8.8, 0, 0]
-       - Variable y1 is at its upper bound (300)
-       - The value 8.8 corresponds to y1's upper bound dual
-       - Transformed vector: [-3.2, 0.0, -8.8, 0]
-       
-    This generic approach handles the dual transformation without requiring
-    special case logic for specific scenarios or iterations.
-    """)
+       - Lower bound duals are omitted, since the lower bounds are 0 and
+         contribute nothing to π^T h.
+    
+    3. Sign Conventions:
+       - For a minimization, the duals of ≤ rows and of upper bounds are ≤ 0,
+         while the dual of a lower bound is ≥ 0.
+       - A variable's column dual is the dual of whichever bound is active, so
+         the upper bound dual is the (negative) column dual of a variable at
+         its upper bound, and 0 otherwise.
+       - The constraint duals and upper bound duals therefore share one sign
+         convention and are concatenated without any further changes.
+    
+    4. Example Scenario 2, Iteration 2:
+       - Constraint duals: [-3.2, 0.0]
+       - Column duals: [-8.8, 0.0] (y1 is at its upper bound 300)
+       - π = [-3.2, 0.0, -8.8, 0.0]
+    
+    The same rule is used for every scenario and iteration, whether the
+    subproblems are solved one at a time or together in one batched LP.
+    """
 
-def optimality_cut_calculation():
+def dual_transformation_explanation():
     """
-    Explanation of how optimality cuts are calculated.
+    Detailed explanation of how the dual values are obtained.
     """
-    print("""
+    return _DUAL_TRANSFORMATION
+
+_CUT_CALCULATION = """
     Optimality Cut Calculation:
     =========================
     
@@ -268,22 +281,24 @@ def optimality_cut_calculation():
     - E_2 = 0.6 * 0 = 0
     
     - E = [115.2, 0]
-    """)
+    """
 
-def implementation_insights():
+def optimality_cut_calculation():
     """
-    Key insights and challenges encountered in the implementation.
+    Explanation of how optimality cuts are calculated.
     """
-    print("""
+    return _CUT_CALCULATION
+
+_INSIGHTS = """
     Implementation Insights and Challenges:
     =====================================
     
     1. Dual Value Extraction:
        - Different solvers may return dual information in different formats.
-       - GLPK (used in this implementation) requires careful extraction of duals
-         for both constraints and variable bounds.
-       - The raw dual vector needs interpretation to correctly identify which values
-         correspond to which constraints and bounds.
+       - HiGHS (used in this implementation) returns separate duals for the
+         constraint rows and for the variables (columns).
+       - The column duals need interpretation to correctly identify which values
+         correspond to upper bounds.
     
     2. Numerical Stability:
        - Small numerical differences can affect the convergence behavior.
@@ -310,13 +325,15 @@ def implementation_insights():
        - Each scenario contributes to the optimality cut based on its probability and
          dual solution.
        - The total cut components are the probability-weighted sum across all scenarios.
-    """)
+    """
 
-def convergence_behavior():
+def implementation_insights():
     """
-    Expected convergence behavior of the algorithm.
+    Key insights and challenges encountered in the implementation.
     """
-    print("""
+    return _INSIGHTS
+
+_CONVERGENCE = """
     Convergence Behavior:
     ===================
     
@@ -344,32 +361,25 @@ def convergence_behavior():
     
     Note: The exact convergence path may vary slightly based on numerical precision
     and the specific implementation details.
-    """)
+    """
+
+def convergence_behavior():
+    """
+    Expected convergence behavior of the algorithm.
+    """
+    return _CONVERGENCE
+
+# Sections of the document, in print order
+_SECTIONS = (
+    algorithm_overview,
+    detailed_steps,
+    iteration_examples,
+    dual_transformation_explanation,
+    optimality_cut_calculation,
+    implementation_insights,
+    convergence_behavior
+)
 
 if __name__ == "__main__":
-    print("\n" + "="*80)
-    print(" L-SHAPED METHOD IMPLEMENTATION: DETAILED WORKFLOW ".center(80, '='))
-    print("="*80 + "\n")
-    
-    algorithm_overview()
-    print("\n" + "-"*80 + "\n")
-    
-    detailed_steps()
-    print("\n" + "-"*80 + "\n")
-    
-    iteration_examples()
-    print("\n" + "-"*80 + "\n")
-    
-    dual_transformation_explanation()
-    print("\n" + "-"*80 + "\n")
-    
-    optimality_cut_calculation()
-    print("\n" + "-"*80 + "\n")
-    
-    implementation_insights()
-    print("\n" + "-"*80 + "\n")
-    
-    convergence_behavior()
-    print("\n" + "="*80)
-    print(" END OF WORKFLOW DOCUMENTATION ".center(80, '='))
-    print("="*80 + "\n")
\ No newline at end of file
+    # Sections are followed by a newline, as when they were printed
+    sys.stdout.write(_TOP + (_SECTION_SEP + "\n").join([section() + "\n" for section in _SECTIONS]) + _BOT)